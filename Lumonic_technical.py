@@ -1,13 +1,14 @@
 # PART 1: Simple JSON output
 import requests
 import json
+import orjson
 
 base_url = "https://www.reddit.com/r/politics.json" 
 
 try:
     response = requests.get(base_url, headers = {"User-Agent":"python"})
     response.raise_for_status()
-    data = response.json()
+    data = orjson.loads(response.content)
 except json.JSONDecodeError:
     print("Invalid JSON Response from server")
     exit(1)
@@ -58,8 +59,8 @@ def export_as_json(top_ten):
         })
 
     try:
-        with open('top_ten.json', 'w') as f:
-            json.dump(posts_to_save, f, indent=2)
+        with open('top_ten.json', 'wb') as f:
+            f.write(orjson.dumps(posts_to_save, option=orjson.OPT_INDENT_2))
         print("Exported the top 10 as a json file!")
     except IOError as e:
         print(f"Error saving file: {e}")
@@ -3,148 +3,389 @@
 # in a SQLite file and generates an HTML report
 
 import requests
-import json
+import html
+import re
 import sqlite3
 import argparse
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import List, Optional
-from pydantic import BaseModel, Field, validator
-from textblob import TextBlob
-
-# Data validation and normalization via Pydantic
-class RedditPost(BaseModel):
-    post_id: str = Field(..., description="Unique Reddit post ID")
-    subreddit: str = Field(..., min_length=1)
-    title: str = Field(..., min_length=1)
-    author: str = Field(default="[deleted]")
-    score: int = Field(default=0, ge=0)
-    num_comments: int = Field(default=0, ge=0)
-    upvote_ratio: float = Field(default=0.5, ge=0.0, le=1.0)
+from string import Template
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import orjson
+import textblob
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Upper bound on concurrent subreddit fetches
+MAX_FETCH_WORKERS = 16
+
+# Keys every raw post must carry to be normalized
+REQUIRED_FIELDS = ("id", "title", "author", "score", "num_comments", "upvote_ratio")
+
+# Column list and single-row placeholder shared by the posts INSERTs
+POST_COLUMNS = (
+    "post_id, subreddit, title, author, score, num_comments, "
+    "upvote_ratio, sentiment_score, sentiment_label, fetched_at"
+)
+ROW_PLACEHOLDER = "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+# Secondary indexes on posts: sort keys used by get_analytics, plus
+# subreddit for per-subreddit lookups
+POST_INDEXES = {
+    "idx_posts_sent": "posts(sentiment_score)",
+    "idx_posts_score": "posts(score DESC)",
+    "idx_posts_sub": "posts(subreddit)",
+}
+
+# Buffered rows written per flush by DatabaseManager.buffered_insert
+FLUSH_ROWS = 500
+
+# Rows per multi-row INSERT; 90 rows x 10 columns stays under SQLite's
+# historical limit of 999 bound parameters per statement
+INSERT_CHUNK_ROWS = 90
+
+# Title tokenizer, compiled once; a single linear scan per title
+WORD_PATTERN = re.compile(r"[A-Za-z']+")
+
+# Sentiment lexicon shipped with TextBlob, parsed on first use and cached.
+# Each word can have several senses, so polarities are averaged per word.
+# Words map to integer ids indexing a flat polarity array.
+@lru_cache(maxsize=None)
+def _load_lexicon() -> Tuple[Dict[str, int], np.ndarray]:
+    path = Path(textblob.__file__).parent / "en" / "en-sentiment.xml"
+    senses = defaultdict(list)
+    for word in ET.parse(path).getroot().iter("word"):
+        senses[word.get("form").lower()].append(float(word.get("polarity", 0.0)))
+
+    word_ids = {form: i for i, form in enumerate(senses)}
+    polarity = np.fromiter(
+        (sum(values) / len(values) for values in senses.values()),
+        dtype=np.float64, count=len(senses)
+    )
+    return word_ids, polarity
+
+def score_titles(titles: List[str]) -> np.ndarray:
+    """
+    Score a batch of titles against the sentiment lexicon.
+
+    A title's polarity is the mean polarity of its lexicon words; a word
+    preceded by "not" or an "n't" contraction has its polarity flipped and
+    halved. Titles without any lexicon words score 0.0.
+    """
+    word_ids, polarity = _load_lexicon()
+
+    # Each distinct title is tokenized once
+    positions: Dict[str, int] = {}
+    inverse = [positions.setdefault(title, len(positions)) for title in titles]
+
+    # Flatten every lexicon hit into parallel arrays, then average per title
+    # with bincount instead of a Python loop per title
+    hits, weights, owners = [], [], []
+    for i, title in enumerate(positions):
+        tokens = WORD_PATTERN.findall(title.lower())
+        for j, tok in enumerate(tokens):
+            word_id = word_ids.get(tok)
+            if word_id is not None:
+                negated = j > 0 and (tokens[j - 1] == "not" or tokens[j - 1].endswith("n't"))
+                hits.append(word_id)
+                weights.append(-0.5 if negated else 1.0)
+                owners.append(i)
+
+    owners = np.asarray(owners, dtype=np.intp)
+    values = polarity[np.asarray(hits, dtype=np.intp)] * np.asarray(weights)
+    sums = np.bincount(owners, weights=values, minlength=len(positions))
+    counts = np.bincount(owners, minlength=len(positions))
+    means = np.divide(sums, counts, out=np.zeros(len(positions)), where=counts > 0)
+
+    return means[np.asarray(inverse, dtype=np.intp)]
+
+def classify_scores(scores: np.ndarray) -> np.ndarray:
+    """Map polarity scores to Positive / Negative / Neutral labels."""
+    return np.where(scores > 0.1, "Positive", np.where(scores < -0.1, "Negative", "Neutral"))
+
+# Normalized post record; fields come from Reddit already typed, so no
+# per-field validation is done on construction
+@dataclass(slots=True)
+class RedditPost:
+    post_id: str
+    subreddit: str
+    title: str
+    author: str = "[deleted]"
+    score: int = 0
+    num_comments: int = 0
+    upvote_ratio: float = 0.5
 
     sentiment_score: Optional[float] = None
     sentiment_label: Optional[str] = None
-    fetched_at: datetime = Field(default_factory=datetime.now)
 
 # Extract data from Reddit
 class RedditDataExtractor:
     def __init__(self):
-        pass
+        # One session shared by all fetches so connections are kept alive;
+        # 429 and 5xx responses from Reddit are retried with backoff
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": "reddit-pipeline/1.0"})
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(
+            pool_connections=MAX_FETCH_WORKERS,
+            pool_maxsize=MAX_FETCH_WORKERS,
+            max_retries=retries
+        )
+        self.session.mount("https://", adapter)
 
     def fetch_subreddit(self, subreddit: str, limit: int = 25) -> List[dict]:
         url = f"https://www.reddit.com/r/{subreddit}/hot.json"
         
         try:
-            response = requests.get(url, headers = {"User-Agent": "Any string"})
-            data = response.json()
+            response = self.session.get(url, params={"limit": limit}, timeout=10)
+            data = orjson.loads(response.content)
             return data["data"]["children"]
         except Exception as e:
             print(f"Error fetching r/{subreddit}: {e}.")
+            return []
+
+    def fetch_all(self, subreddits: List[str], limit: int = 25) -> Dict[str, List[dict]]:
+        """
+        Fetch several subreddits concurrently.
+        
+        Returns:
+            Mapping of subreddit name to its raw posts, in request order
+        """
+        workers = min(len(subreddits), MAX_FETCH_WORKERS) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda name: self.fetch_subreddit(name, limit), subreddits)
+            return dict(zip(subreddits, results))
     
-    def normalize_post(self, raw_post: dict, subreddit: str) -> Optional[RedditPost]:
+    def normalize_batch(self, raw_posts: List[dict], subreddit: str,
+                        known: Optional[Dict[str, Tuple[str, float]]] = None) -> List[RedditPost]:
         """
-        Normalize and validate raw Reddit post data.
+        Normalize a subreddit's raw posts and score their sentiment in one pass.
         
         Args:
-            raw_post: Raw post data from Reddit API
+            raw_posts: Raw post data from Reddit API
             subreddit: Subreddit name for context
+            known: Stored (title, sentiment_score) by post_id; posts whose
+                title is unchanged reuse the stored score
             
         Returns:
-            Validated RedditPost object or None if validation fails
+            RedditPost objects for every post with the required fields
         """
-        try:
-            post_data = raw_post["data"]
-            title = post_data["title"]
+        records = []
+        for raw_post in raw_posts:
+            post_data = raw_post.get("data", {})
+            if all(key in post_data for key in REQUIRED_FIELDS) and post_data["title"]:
+                records.append(post_data)
+        
+        skipped = len(raw_posts) - len(records)
+        if skipped:
+            print(f"Skipped {skipped} malformed posts from r/{subreddit}")
 
-            # Perform sentiment analysis on title via TextBlob
-            blob = TextBlob(title)
-            sentiment_score = blob.sentiment.polarity
-            
-            # Classify sentiment
-            if sentiment_score > 0.1:
-                sentiment_label = "Positive"
-            elif sentiment_score < -0.1:
-                sentiment_label = "Negative"
+        # Column-wise extraction so sentiment runs once over all titles
+        post_ids = [r["id"] for r in records]
+        titles = [r["title"] for r in records]
+        authors = [r["author"] for r in records]
+        scores = [r["score"] for r in records]
+        num_comments = [r["num_comments"] for r in records]
+        upvote_ratios = [r["upvote_ratio"] for r in records]
+
+        known = known or {}
+        sentiment = np.empty(len(records))
+        pending = []
+
+        for i, (post_id, title) in enumerate(zip(post_ids, titles)):
+            stored = known.get(post_id)
+            if stored and stored[0] == title:
+                sentiment[i] = stored[1]
             else:
-                sentiment_label = "Neutral"
-            
-            return RedditPost(
-                post_id=post_data["id"],         
-                subreddit=subreddit,
-                title=title,
-                author=post_data["author"],    
-                score=post_data["score"],         
-                num_comments=post_data["num_comments"], 
-                upvote_ratio=post_data["upvote_ratio"], 
-                sentiment_score=sentiment_score,
-                sentiment_label=sentiment_label
-            )
-        except Exception as e:
-            print(f"Error normalizing post: {e}")
-            return None
+                pending.append(i)
+
+        sentiment[pending] = score_titles([titles[i] for i in pending])
+        labels = classify_scores(sentiment).tolist()
+
+        return [
+            RedditPost(post_id, subreddit, title, author, score, comments, ratio,
+                       sentiment_score, label)
+            for post_id, title, author, score, comments, ratio, sentiment_score, label
+            in zip(post_ids, titles, authors, scores, num_comments, upvote_ratios,
+                   sentiment.tolist(), labels)
+        ]
 
 class DatabaseManager:
     """Manages SQLite database operations (PostgreSQL-compatible syntax)."""
     
     def __init__(self, db_path: str = "reddit_analytics.db"):
         self.db_path = db_path
+        self._conn = self._connect()
+        self._buffer: List[tuple] = []
         self._create_tables()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the long-lived connection, tuned for bulk writes."""
+        # isolation_level=None turns off sqlite3's implicit transactions;
+        # writes are wrapped in explicit BEGIN IMMEDIATE / COMMIT instead
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        self._configure(conn)
+        return conn
+
+    @staticmethod
+    def _configure(conn: sqlite3.Connection) -> None:
+        # WAL avoids rewriting the rollback journal on every commit and
+        # NORMAL drops the extra fsync per commit; both are safe in WAL mode.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Run the block in one write transaction, rolling back on error."""
+        cursor = self._conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("COMMIT")
+
+    def close(self) -> None:
+        self._conn.close()
     
     def _create_tables(self):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._transaction() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS posts (
+                    post_id TEXT PRIMARY KEY,
+                    subreddit TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    author TEXT,
+                    score INTEGER,
+                    num_comments INTEGER,
+                    upvote_ratio REAL,
+                    sentiment_score REAL,
+                    sentiment_label TEXT,
+                    fetched_at TIMESTAMP
+                )
+            """)
+            self._create_indexes(cursor)
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS posts (
-                post_id TEXT PRIMARY KEY,
-                subreddit TEXT NOT NULL,
-                title TEXT NOT NULL,
-                author TEXT,
-                score INTEGER,
-                num_comments INTEGER,
-                upvote_ratio REAL,
-                sentiment_score REAL,
-                sentiment_label TEXT,
-                fetched_at TIMESTAMP
-            )
-        """)
-        conn.commit()
-        conn.close()
+    @staticmethod
+    def _create_indexes(cursor: sqlite3.Cursor) -> None:
+        for name, target in POST_INDEXES.items():
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
     
-    def insert_posts(self, posts: List[RedditPost]) -> int:
+    def insert_posts(self, posts: List[RedditPost], fetched_at: Optional[str] = None) -> int:
         """
         Insert posts into database (upsert on conflict).
         
+        Args:
+            posts: Posts to store
+            fetched_at: ISO timestamp shared by every row; defaults to now
+        
+        Returns:
+            Number of posts inserted
+        """
+        fetched_at = fetched_at or datetime.now().isoformat()
+        return self._insert_rows([self._row(post, fetched_at) for post in posts])
+
+    def buffered_insert(self, post: RedditPost, fetched_at: str) -> int:
+        """
+        Queue a post for insertion, writing the queue once it is full.
+        
+        Returns:
+            Number of posts inserted by this call (0 unless it flushed)
+        """
+        self._buffer.append(self._row(post, fetched_at))
+        if len(self._buffer) >= FLUSH_ROWS:
+            return self.flush()
+        return 0
+
+    def flush(self) -> int:
+        """
+        Write any posts queued by buffered_insert.
+        
         Returns:
             Number of posts inserted
         """
-        conn = sqlite3.connect(self.db_path) 
-        cursor = conn.cursor()
+        rows, self._buffer = self._buffer, []
+        return self._insert_rows(rows)
+
+    @staticmethod
+    def _row(post: RedditPost, fetched_at: str) -> tuple:
+        return (post.post_id, post.subreddit, post.title, post.author,
+                post.score, post.num_comments, post.upvote_ratio,
+                post.sentiment_score, post.sentiment_label, fetched_at)
+
+    def _insert_rows(self, rows: List[tuple]) -> int:
+        # Full chunks go through one multi-row INSERT each; the remainder
+        # uses the single-row statement
+        full = len(rows) - len(rows) % INSERT_CHUNK_ROWS
+        chunk_sql = (
+            f"INSERT OR REPLACE INTO posts ({POST_COLUMNS}) VALUES "
+            + ", ".join([ROW_PLACEHOLDER] * INSERT_CHUNK_ROWS)
+        )
+        row_sql = f"INSERT OR REPLACE INTO posts ({POST_COLUMNS}) VALUES {ROW_PLACEHOLDER}"
         inserted = 0
 
-        for post in posts:
-            try:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO posts 
-                    (post_id, subreddit, title, author, score, num_comments, 
-                     upvote_ratio, sentiment_score, 
-                     sentiment_label, fetched_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    post.post_id, post.subreddit, post.title, post.author,
-                    post.score, post.num_comments, post.upvote_ratio,
-                    post.sentiment_score, post.sentiment_label, 
-                    post.fetched_at.isoformat()
-                ))
-                conn.commit()
-                inserted += 1
-
-            except Exception as e:
-                print(f"Error inserting post {post.post_id}: {e}")
+        # One transaction for the whole batch instead of a commit per row
+        try:
+            with self._transaction() as cursor:
+                for start in range(0, full, INSERT_CHUNK_ROWS):
+                    chunk = rows[start:start + INSERT_CHUNK_ROWS]
+                    cursor.execute(chunk_sql, list(chain.from_iterable(chunk)))
+                    inserted += cursor.rowcount
+
+                cursor.executemany(row_sql, rows[full:])
+                inserted += cursor.rowcount
+
+        except Exception as e:
+            print(f"Error inserting posts: {e}")
+            inserted = 0
         
-        conn.close()
         return inserted
     
+    def bulk_insert(self, posts: List[RedditPost], fetched_at: Optional[str] = None) -> int:
+        """
+        Insert a large batch of posts with the secondary indexes dropped.
+        
+        The indexes are rebuilt once after the load, which is cheaper than
+        maintaining them row by row.
+        
+        Returns:
+            Number of posts inserted
+        """
+        with self._transaction() as cursor:
+            for name in POST_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+        try:
+            return self.insert_posts(posts, fetched_at)
+        finally:
+            with self._transaction() as cursor:
+                self._create_indexes(cursor)
+    
+    def get_scored_titles(self) -> Dict[str, Tuple[str, float]]:
+        """
+        Load the title and sentiment score of every stored post.
+        
+        Returns:
+            Mapping of post_id to (title, sentiment_score)
+        """
+        cursor = self._conn.execute("""
+            SELECT post_id, title, sentiment_score
+            FROM posts
+            WHERE sentiment_score IS NOT NULL
+        """)
+        return {post_id: (title, score) for post_id, title, score in cursor.fetchall()}
+    
     def get_analytics(self) -> dict:
         """
         Generate analytics from stored posts.
@@ -152,15 +393,17 @@ class DatabaseManager:
         Returns:
             Dictionary with aggregated statistics
         """
-        conn = sqlite3.connect(self.db_path) 
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
-        # Overall stats
+        # Overall stats plus the most positive / negative titles in one
+        # statement; the ORDER BY ... LIMIT 1 subqueries seek idx_posts_sent
         cursor.execute("""
             SELECT 
                 COUNT(*),
                 AVG(score),
-                AVG(num_comments)
+                AVG(num_comments),
+                (SELECT title FROM posts ORDER BY sentiment_score DESC LIMIT 1),
+                (SELECT title FROM posts ORDER BY sentiment_score ASC LIMIT 1)
             FROM posts
         """)
 
@@ -170,24 +413,8 @@ class DatabaseManager:
             "avg_score": raw_overall[1],
             "avg_comments": raw_overall[2]
         }
-        
-        # Most positive post
-        cursor.execute("""
-            SELECT title FROM posts
-            ORDER BY sentiment_score DESC
-            LIMIT 1
-        """)
-        most_positive_row = cursor.fetchone()
-        most_positive_title = most_positive_row[0]
-
-        # Most negative post
-        cursor.execute("""
-            SELECT title FROM posts
-            ORDER BY sentiment_score ASC
-            LIMIT 1
-        """)
-        most_negative_row = cursor.fetchone()
-        most_negative_title = most_negative_row[0]
+        most_positive_title = raw_overall[3]
+        most_negative_title = raw_overall[4]
 
         # Sentiment distribution
         cursor.execute("""
@@ -208,7 +435,6 @@ class DatabaseManager:
             LIMIT 10
         """)
         top_posts_tuples = cursor.fetchall()
-        conn.close()
         
         return {
             "overall": overall,
@@ -218,63 +444,57 @@ class DatabaseManager:
             "most_negative_title": most_negative_title
         }
 
+# Report skeleton; only the data sections are filled in per run
+REPORT_TEMPLATE = Template("""<html><body>
+<h1>Reddit Report</h1>
+<p>Generated at: $generated_at</p>
+<hr>
+<h2>Overall Stats</h2>
+<p>Total Posts: $total_posts</p>
+<p>Avg Score: $avg_score</p>
+<p>Avg Comments: $avg_comments</p>
+<hr>
+<h2>Sentiment</h2>
+<p><b>Most Positive:</b> $most_positive</p>
+<p><b>Most Negative:</b> $most_negative</p>
+<p><b>Distribution:</b></p>
+$distribution
+<hr>
+<h2>Top Posts</h2>
+<table border='1' cellpadding='5' style='border-collapse: collapse; width: 100%;'>
+<tr><th>Title</th><th>Subreddit</th><th>Score</th><th>Sentiment</th></tr>
+$top_rows
+</table>
+</body></html>
+""")
+
 # HTML-styled report
 class ReportGenerator:
-    def generate_html_report(analytics):
+    def generate_html_report(self, analytics: dict, output_path: str = "report.html"):
         """Generate an HTML report with inline visualizations."""
-        f = open("report.html", "w")
-        
-        f.write("<html><body>")
-        f.write("<h1>Reddit Report</h1>")
-        f.write("<p>Generated at: " + str(datetime.now()) + "</p>")
-        f.write("<hr>")
-
-        # Overall Stats
-        f.write("<h2>Overall Stats</h2>")
-        f.write("<p>Total Posts: " + str(analytics['overall']['total_posts']) + "</p>")
-        f.write("<p>Avg Score: " + str(analytics['overall']['avg_score']) + "</p>")
-        f.write("<p>Avg Comments: " + str(analytics['overall']['avg_comments']) + "</p>")
-    
-        f.write("<hr>")
+        overall = analytics['overall']
 
-        # Sentiment data
-        f.write("<h2>Sentiment</h2>")
-        f.write("<p><b>Most Positive:</b> " + analytics['most_positive_title'] + "</p>")
-        f.write("<p><b>Most Negative:</b> " + analytics['most_negative_title'] + "</p>")
-        
-        f.write("<p><b>Distribution:</b></p>") 
-
-        for label in analytics['sentiment_distribution']:
-            count = analytics['sentiment_distribution'][label]
-            f.write("<p>" + label + ": " + str(count) + "</p>")
-
-        # "Top Posts" table 
-        f.write("<hr>")
-        f.write("<h2>Top Posts</h2>")
-        f.write("<table border='1' cellpadding='5' style='border-collapse: collapse; width: 100%;'>")
-        f.write("<tr>")
-        f.write("<th>Title</th>")
-        f.write("<th>Subreddit</th>")
-        f.write("<th>Score</th>")
-        f.write("<th>Sentiment</th>") 
-        f.write("</tr>")
-
-        for post in analytics['top_posts']:
-            title = post[0]
-            subreddit = post[1]
-            score = post[2]
-            sentiment = post[3]
-            
-            f.write("<tr>")
-            f.write("<td>" + title + "</td>")
-            f.write("<td>r/" + subreddit + "</td>")
-            f.write("<td>" + str(score) + "</td>")
-            f.write("<td>" + sentiment.title() + "</td>")
-            f.write("</tr>")
-        
-        f.write("</table>")
-        f.write("</body></html>")
-        f.close()
+        distribution = "\n".join(
+            f"<p>{html.escape(str(label))}: {count}</p>"
+            for label, count in analytics['sentiment_distribution'].items()
+        )
+        top_rows = "\n".join(
+            f"<tr><td>{html.escape(title)}</td><td>r/{html.escape(subreddit)}</td>"
+            f"<td>{score}</td><td>{sentiment.title()}</td></tr>"
+            for title, subreddit, score, sentiment in analytics['top_posts']
+        )
+
+        # Single write for the whole document
+        Path(output_path).write_text(REPORT_TEMPLATE.substitute(
+            generated_at=datetime.now(),
+            total_posts=overall['total_posts'],
+            avg_score=overall['avg_score'],
+            avg_comments=overall['avg_comments'],
+            most_positive=html.escape(str(analytics['most_positive_title'])),
+            most_negative=html.escape(str(analytics['most_negative_title'])),
+            distribution=distribution,
+            top_rows=top_rows
+        ), encoding="utf-8")
     
         print("Report generated.") 
 
@@ -309,34 +529,36 @@ def main():
     print("Reddit Analytics Pipeline")
     print("=" * 50)
     
+    # Previously stored titles let unchanged posts skip sentiment analysis
+    db = DatabaseManager(args.db)
+    known = db.get_scored_titles()
+    
     # Extract data
     extractor = RedditDataExtractor()
-    all_posts = []
     
-    for subreddit in args.subreddits:
-        print(f"\nFetching r/{subreddit}...")
-        raw_posts = extractor.fetch_subreddit(subreddit, args.limit)
-        
-        for raw_post in raw_posts:
-            post = extractor.normalize_post(raw_post, subreddit)
-            if post:
-                all_posts.append(post)
-        
-        print(f"Retrieved {len(raw_posts)} posts")
+    print(f"\nFetching {', '.join('r/' + name for name in args.subreddits)}...")
+    fetched = extractor.fetch_all(args.subreddits, args.limit)
+    fetched_at = datetime.now().isoformat()
     
-    print(f"\nStoring {len(all_posts)} posts in database")
+    # Normalize and store each subreddit's posts as they are processed
+    inserted = 0
+    for subreddit, raw_posts in fetched.items():
+        for post in extractor.normalize_batch(raw_posts, subreddit, known):
+            inserted += db.buffered_insert(post, fetched_at)
+        
+        print(f"Retrieved {len(raw_posts)} posts from r/{subreddit}")
     
-    # Store in database
-    db = DatabaseManager(args.db)
-    inserted = db.insert_posts(all_posts)
-    print(f"Inserted {inserted} posts")
+    inserted += db.flush()
+    print(f"\nInserted {inserted} posts")
     
     print(f"\nGenerating analytics")
     analytics = db.get_analytics()
     
     # Generate report
     print(f"\nCreating HTML report...")
-    ReportGenerator.generate_html_report(analytics)
+    ReportGenerator().generate_html_report(analytics, args.output)
+    
+    db.close()
     
     print(f"\nPipeline complete!")
     print(f"   - Database: {args.db}")